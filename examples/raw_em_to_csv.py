@@ -0,0 +1,18 @@
+import argparse
+import sys
+
+import airel.tic.util.records_logger as records_logger
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Converts a binary raw electrometer file to the CSV format")
+    ap.add_argument("input", help="Binary raw electrometer file")
+    args = ap.parse_args()
+
+    sys.stdout.write("timestamp,mcutime,channel,value\n")
+    for ts, mcutime, channel, value in records_logger.read_raw_em_binary(args.input):
+        sys.stdout.write(f"{ts},{mcutime},{channel},{value}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,14 @@
 import collections
 import json
 import time
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, Optional, Tuple, Union
 import random
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 try:
     from .libusb_interface import LibusbInterface
 except ImportError:
@@ -18,6 +23,19 @@ from .exceptions import EncodingError, ReceiveTimeout, DecodingError, DeviceErro
 
 CONNECTION_INIT_TIMEOUT = 1.0
 
+if orjson is not None:
+
+    def _json_loads(data):
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # orjson rejects the NaN and Infinity tokens that json.loads accepts, messages that are invalid also for
+            # json.loads raise json.JSONDecodeError from there
+            return json.loads(data)
+
+else:
+    _json_loads = json.loads
+
 
 class Tic:
     """
@@ -96,11 +114,11 @@ class Tic:
         self.close()
 
     def _receive_response(self, timeout: float = 1.0) -> Any:
-        tend = time.time() + timeout
-        while time.time() < tend:
+        tend = time.monotonic() + timeout
+        while (remaining := tend - time.monotonic()) > 0:
             try:
-                payload = self.port.read()
-                msg = json.loads(payload)
+                payload = self.port.read(timeout=remaining)
+                msg = _json_loads(payload)
             except ReceiveTimeout:
                 continue
             except json.JSONDecodeError as e:
@@ -135,13 +153,13 @@ class Tic:
         elif timeout == 0:
             return None
         else:
-            tend = time.time() + timeout
-            while time.time() < tend:
+            tend = time.monotonic() + timeout
+            while (remaining := tend - time.monotonic()) > 0:
                 try:
-                    payload = self.port.read()
+                    payload = self.port.read(timeout=remaining)
                     if len(payload) == 0:
                         continue
-                    msg = json.loads(payload)
+                    msg = _json_loads(payload)
                 except ReceiveTimeout:
                     continue
                 except json.JSONDecodeError as e:
@@ -155,6 +173,22 @@ class Tic:
 
             return None
 
+    def receive_record(self, timeout: float = 1.0) -> Tuple[bool, Any]:
+        """
+        Returns next message received from the device, unwrapping record events
+
+        Works like :py:func:`receive_message`, but record events are returned as ``(True, params)`` where ``params`` is
+        the record itself. All other messages are returned as ``(False, message)``, or ``(False, None)`` if no message
+        was received.
+
+        :param timeout: timeout in seconds
+        :return: tuple of a flag telling if the message is a record and the record or message
+        """
+        msg = self.receive_message(timeout)
+        if msg is not None and msg.get("event", None) == "record":
+            return True, msg["params"]
+        return False, msg
+
     def _wait_ok_response(self, timeout: float = 1.0):
         response = self._receive_response(timeout)
         if response != "ok":
@@ -173,8 +207,8 @@ class Tic:
         self.port.flush_read()
         ping_payload = str(random.randrange(0, 1000000000))
         self._send_json_msg({"method": "ping", "params": ping_payload})
-        tend = time.time() + CONNECTION_INIT_TIMEOUT
-        while time.time() < tend:
+        tend = time.monotonic() + CONNECTION_INIT_TIMEOUT
+        while time.monotonic() < tend:
             try:
                 resp = self.receive_message(timeout=0.1)
             except DecodingError:
@@ -293,4 +327,4 @@ class Tic:
         """
         self._send_json_msg({"method": "get_flag_descriptions"})
         response = self._receive_response()
-        return {k: v for (k, v) in response}
+        return dict(response)
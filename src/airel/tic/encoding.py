@@ -1,18 +1,65 @@
+import binascii
+
 from cobs import cobs
 from .exceptions import DecodingError
 
+try:
+    # The C implementation is only available when the cobs package was installed from a binary wheel or compiled
+    from cobs.cobs import _cobs_ext
+except ImportError:
+    _cobs_ext = None
+
 
 def update_checksum(crc, data):
-    for byte in data:
-        crc = crc ^ (byte << 8)
+    # CRC-16/CCITT (polynomial 0x1021, not reflected), binascii.crc_hqx implements exactly this in C
+    return binascii.crc_hqx(data, crc)
+
+
+def _cobs_encode(data: bytes) -> bytes:
+    # Same output as cobs.encode, but works on whole zero-free runs instead of individual bytes
+    out = bytearray()
+    parts = bytes(data).split(b"\x00")
+    for part in parts:
+        while len(part) >= 0xFE:
+            out.append(0xFF)
+            out += part[:0xFE]
+            part = part[0xFE:]
+        out.append(len(part) + 1)
+        out += part
+    # Like cobs.encode, a final run of full blocks is not followed by an empty block
+    if parts[-1] and len(parts[-1]) % 0xFE == 0:
+        del out[-1]
+    return bytes(out)
+
+
+def _cobs_decode(data: bytes) -> bytes:
+    # Same as cobs.decode, but copies whole blocks instead of individual bytes
+    data = bytes(data)
+    out = bytearray()
+    pos = 0
+    while pos < len(data):
+        code = data[pos]
+        if code == 0:
+            raise cobs.DecodeError("zero byte found in input")
+        end = pos + code
+        if end > len(data):
+            raise cobs.DecodeError("not enough input bytes for length code")
+        block = data[pos + 1:end]
+        if 0 in block:
+            raise cobs.DecodeError("zero byte found in input")
+        out += block
+        pos = end
+        if code != 0xFF and pos < len(data):
+            out.append(0)
+    return bytes(out)
 
-        for i in range(8):
-            if crc & 0x8000 != 0:
-                crc = ((crc << 1) ^ 0x1021) & 0xFFFF
-            else:
-                crc = (crc << 1) & 0xFFFF
 
-    return crc
+if _cobs_ext is not None:
+    cobs_encode = _cobs_ext.encode
+    cobs_decode = _cobs_ext.decode
+else:
+    cobs_encode = _cobs_encode
+    cobs_decode = _cobs_decode
 
 
 def decode(packet: bytes) -> bytes:
@@ -20,7 +67,7 @@ def decode(packet: bytes) -> bytes:
         return b""
 
     try:
-        contents = cobs.decode(packet)
+        contents = cobs_decode(packet)
     except cobs.DecodeError as e:
         raise DecodingError(f"decoding error: {e}")
 
@@ -39,4 +86,4 @@ def encode(payload: bytes) -> bytes:
     if len(payload) == 0:
         return b""
     crc = update_checksum(0, payload)
-    return cobs.encode(payload + crc.to_bytes(2, 'little'))
+    return cobs_encode(payload + crc.to_bytes(2, 'little'))
@@ -1,3 +1,4 @@
+import collections
 from typing import Union
 
 import usb.core
@@ -14,6 +15,8 @@ TIC_OUT_EP = 0x01
 TIC_INTERFACE = 0
 
 RECEIVE_BUFFER_SIZE = 10 * 1024
+READ_TIMEOUT = 0.1
+MAX_READ_TIMEOUT = 1.0
 
 
 def _open_libusb_device(serial_number: Union[str, None]) -> usb.core.Device:
@@ -54,7 +57,10 @@ class LibusbInterface:
         try:
             self.device = None
             self.device = _open_libusb_device(port_name)
+            # Incomplete frame received so far, never contains the frame delimiter between calls
             self.buf = bytearray()
+            # Complete frames that have been received but not yet returned by read
+            self.frames = collections.deque()
             try:
                 if self.device.is_kernel_driver_active(TIC_INTERFACE):
                     self.device.detach_kernel_driver(TIC_INTERFACE)
@@ -79,27 +85,28 @@ class LibusbInterface:
         except usb.core.USBError as e:
             raise CommunicationError(f"write error: {e}") from e
 
-    def read(self) -> bytes:
-        while True:
+    def read(self, timeout: float = READ_TIMEOUT) -> bytes:
+        # A bulk transfer completes as soon as the device sends data, so waiting up to the caller's deadline only reduces
+        # the number of transfers on an idle connection. Zero timeout means infinite wait for libusb.
+        timeout_ms = max(1, int(min(timeout, MAX_READ_TIMEOUT) * 1000))
+        while not self.frames:
             try:
-                zero_pos = self.buf.index(0)
-                break
-            except ValueError:
-                pass
-
-            try:
-                bytes_in = self.device.read(TIC_IN_EP, RECEIVE_BUFFER_SIZE, timeout=100)
+                bytes_in = self.device.read(TIC_IN_EP, RECEIVE_BUFFER_SIZE, timeout=timeout_ms)
                 if self.debug and bytes_in:
                     print(f"read: {bytes(bytes_in)}")
-                self.buf += bytes_in
             except usb.core.USBTimeoutError as e:
                 raise ReceiveTimeout(f"read timeout: {e}") from e
             except usb.core.USBError as e:
                 raise CommunicationError(f"read error: {e}") from e
 
-        packet = self.buf[:zero_pos]
-        del self.buf[:zero_pos + 1]
-        return decode(packet)
+            scanned = len(self.buf)
+            self.buf += bytes_in
+            if self.buf.find(0, scanned) != -1:
+                # A single transfer often contains several frames, split all of them at once
+                *frames, self.buf = self.buf.split(b"\x00")
+                self.frames.extend(frames)
+
+        return decode(self.frames.popleft())
 
     def flush_read(self):
         try:
@@ -118,6 +125,7 @@ class LibusbInterface:
             del self.buf[:pos + 1]
         except ValueError:
             del self.buf[:]
+        self.frames.clear()
 
     def close(self):
         if self.device is not None:
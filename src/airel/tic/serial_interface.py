@@ -1,3 +1,4 @@
+import time
 from typing import Union
 
 import serial
@@ -5,12 +6,14 @@ import serial
 from .encoding import decode, encode
 from .exceptions import *
 
+READ_TIMEOUT = 0.1
+
 
 class SerialInterface:
     def __init__(self, port_name: Union[str, None], debug: bool = False):
         try:
             self.port = None
-            self.port = serial.Serial(port_name, timeout=0.1)
+            self.port = serial.Serial(port_name, timeout=READ_TIMEOUT)
             self.buf = bytearray()
         except serial.SerialException as e:
             raise CommunicationError(f"init error: {e}") from e
@@ -26,33 +29,38 @@ class SerialInterface:
         except serial.SerialException as e:
             raise CommunicationError(f"write error: {e}") from e
 
-    def read(self) -> bytes:
-        while True:
-            try:
-                pos = self.buf.index(0)
-                break
-            except ValueError:
-                pass
-
+    def read(self, timeout: float = READ_TIMEOUT) -> bytes:
+        # Each read of the port waits for at most READ_TIMEOUT, or less if the caller's deadline is closer
+        deadline = time.monotonic() + timeout
+        pos = self.buf.find(0)
+        while pos == -1:
             try:
-                bytes_in = self.port.read_until(b"\x00", size=4096)
-                if self.debug and bytes_in:
-                    print(f"read: {bytes(bytes_in)}")
-                self.buf += bytes_in
+                self._set_port_timeout(min(max(deadline - time.monotonic(), 0.0), READ_TIMEOUT))
+                bytes_in = self._read_available()
             except serial.SerialException as e:
                 raise CommunicationError(f"read error: {e}") from e
 
+            if self.debug and bytes_in:
+                print(f"read: {bytes(bytes_in)}")
+            if not bytes_in:
+                raise ReceiveTimeout("read timeout")
+
+            scanned = len(self.buf)
+            self.buf += bytes_in
+            pos = self.buf.find(0, scanned)
+
         packet = self.buf[:pos]
         del self.buf[:pos + 1]
         return decode(packet)
 
     def flush_read(self):
         try:
+            self._set_port_timeout(READ_TIMEOUT)
             for _ in range(100):
-                bytes_in = self.port.read_until(b"\x00", size=4096)
+                bytes_in = self._read_available()
                 if self.debug and bytes_in:
                     print(f"flush read: {bytes(bytes_in)}")
-                if (len(bytes_in) < 4096) and (0 not in bytes_in):
+                if not bytes_in:
                     break
                 self.buf += bytes_in
         except serial.SerialException as e:
@@ -64,6 +72,16 @@ class SerialInterface:
         except ValueError:
             del self.buf[:]
 
+    def _set_port_timeout(self, timeout: float):
+        # Changing the timeout reconfigures the port, so it is only done when the value differs
+        if self.port.timeout != timeout:
+            self.port.timeout = timeout
+
+    def _read_available(self) -> bytes:
+        # Waits up to the port timeout for the first byte and returns everything received by then in a single call.
+        # Serial.read_until would issue a separate read for every byte.
+        return self.port.read(self.port.in_waiting or 1)
+
     def close(self):
         if self.port is not None:
             try:
@@ -1,14 +1,27 @@
+import bisect
 import datetime
+import functools
+import itertools
 import logging
 import math
+import operator
 import pathlib
 import signal
+import struct
 import sys
 import threading
+import time
+from typing import Iterator, Literal, Optional, Tuple
 
 import airel.tic
 import yaml
-from pydantic import BaseModel, PositiveFloat, ConfigDict, ValidationError
+from pydantic import BaseModel, PositiveFloat, PositiveInt, ConfigDict, ValidationError
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
 
 FIELDS = [
     "is_settling",
@@ -98,8 +111,30 @@ MONITORED_COUNTERS = [
     "b_electrometer_error_counter",
 ]
 
+# Fields that are not measurement values and are therefore never rounded in the records file
+_INTEGER_FIELDS = frozenset(f for f in FIELDS if f == "is_settling" or f.endswith(("_time_ms", "_counter")))
+_FIELDS_GETTER = operator.itemgetter(*FIELDS)
+_MONITORED_COUNTERS_GETTER = operator.itemgetter(*MONITORED_COUNTERS)
+
 UTC = datetime.timezone.utc
 
+FILE_BUFFER_SIZE = 64 * 1024
+
+# Records file line: begin and end time, opmode, 8 electrometer columns and FIELDS, followed by an empty flags column.
+# Numeric values are never None after missing fields have been filled with NaN, so %s formats them like str().
+RECORDS_LINE_FORMAT = "\t".join(["%s"] * (11 + len(FIELDS))) + "\t\n"
+
+# Binary raw electrometer file: magic and format version, followed by fixed size records of timestamp, mcutime (-1 if
+# not sent by the device), channel and value
+RAW_EM_BINARY_MAGIC = b"RAWEM\x00\x00\x01"
+RAW_EM_BINARY_RECORD = struct.Struct("<dqBd")
+
+# Arguments: begin time, begin time (s), duration (s), opmode, settling, pos and neg concentration, electrometer A and B
+# current and raw current offset, flag descriptions
+RECORD_SUMMARY_FORMAT = (
+    "%s %9.1f %9.1f %-12s %s pos_conc: %10.3f neg_conc: %10.3f  a: %+9.2f %+6.2f b: %+9.2f %+6.2f flags: %s"
+)
+
 
 class Config(BaseModel):
     model_config = ConfigDict(arbitrary_types_allowed=True, extra="forbid")
@@ -112,6 +147,11 @@ class Config(BaseModel):
     allow_power_from_usb_data: bool = True
     blowers_enabled_during_zero: bool = True
     custom_settings: dict = {}
+    records_format: Literal["records", "parquet"] = "records"
+    raw_em_format: Literal["csv", "binary"] = "csv"
+    # Significant digits of measurement values in the records file. Only numeric values can be rounded, a record with
+    # any other value in a measurement column is written with full precision.
+    records_float_digits: Optional[PositiveInt] = None
 
 
 def run(connection, config):
@@ -122,6 +162,9 @@ def run(connection, config):
     except ValidationError as e:
         raise airel.tic.TicError(f"Invalid configuration: {str(e)}") from None
 
+    if config.records_format == "parquet" and pyarrow is None:
+        raise airel.tic.TicError("Parquet output not supported. Please check if pyarrow package is installed.")
+
     stop_event = threading.Event()
 
     def set_stop_event(sig, frame):
@@ -131,7 +174,7 @@ def run(connection, config):
     signal.signal(signal.SIGTERM, set_stop_event)
 
     logging.info("Starting measurements")
-    logging.info(f"Using configuration: {config}")
+    logging.info("Using configuration: %s", config)
 
     while not stop_event.is_set():
         try:
@@ -152,8 +195,9 @@ def collect_data(device: airel.tic.Tic, stop_event: threading.Event, config: Con
     serial_number = system_info["serial_number"]
 
     logging.info(f"Connected to {serial_number}")
-    logging.debug(f"System info: {system_info}")
-    logging.debug(f"Debug info: {device.get_debug_info()}")
+    if logging.getLogger().isEnabledFor(logging.DEBUG):
+        logging.debug("System info: %s", system_info)
+        logging.debug("Debug info: %s", device.get_debug_info())
 
     settings = {
         "auto_zero_enabled": False,
@@ -170,115 +214,226 @@ def collect_data(device: airel.tic.Tic, stop_event: threading.Event, config: Con
     settings.update(config.custom_settings)
 
     device.reset_settings(settings)
-    logging.info(f"Settings: {device.get_settings()}")
+    if logging.getLogger().isEnabledFor(logging.INFO):
+        logging.info("Settings: %s", device.get_settings())
 
     flag_map = device.get_flag_descriptions()
+    # Descriptions of flag combinations seen so far, records usually repeat the same few combinations
+    flag_descriptions = {}
 
-    records_file = TimedFile(f"./{serial_number}/" + "{t:%Y%m%d}-block.records")
-    raw_em_file = TimedFile(f"./{serial_number}/" + "{t:%Y%m%d}.rawem")
+    records_file = None
+    parquet_file = None
+    if config.records_format == "parquet":
+        parquet_file = ParquetRecordsFile(f"./{serial_number}/" + "{t:%Y%m%d-%H%M%S}-block.parquet")
+    else:
+        records_file = TimedFile(f"./{serial_number}/" + "{t:%Y%m%d}-block.records")
+    # Raw electrometer samples may arrive many times per second, so these are flushed in larger batches
+    raw_em_binary = config.raw_em_format == "binary"
+    raw_em_file = TimedFile(
+        f"./{serial_number}/" + ("{t:%Y%m%d}.rawem.bin" if raw_em_binary else "{t:%Y%m%d}.rawem"),
+        flush_batch_size=1000,
+        flush_interval=1.0,
+    )
 
-    cycle = MeasurementCycle(cycle_def=config.measurement_cycle, shift=config.cycle_shift)
+    cycle = MeasurementCycle(cycle_def=config.measurement_cycle, shift=config.cycle_shift, device=device)
 
-    counter_values = {f: 0 for f in MONITORED_COUNTERS}
+    counter_values = (0,) * len(MONITORED_COUNTERS)
 
-    while not stop_event.is_set():
-        now = datetime.datetime.utcnow().replace(tzinfo=UTC).astimezone(config.local_tz)
-        ts = now.timestamp()
-        mode = cycle.get_mode(ts)
-        if mode is not None:
-            logging.debug(
-                f"{now:%H:%M:%S.%f} set opmode {mode} until {datetime.datetime.fromtimestamp(cycle.next_change)}"
-            )
-            if isinstance(mode, dict):
-                device.set_custom_mode(mode)
-            else:
-                device.set_mode(mode)
+    line_format = records_line_format(config.records_float_digits)
+
+    # Names used for every received message, bound to locals to avoid global and attribute lookups in the loop
+    local_tz = config.local_tz
+    nan = math.nan
+    timedelta = datetime.timedelta
+
+    try:
+        while not stop_event.is_set():
+            if records_file is not None:
+                records_file.flush_if_due()
+            raw_em_file.flush_if_due()
+
+            ts = time.time()
+            mode_change = cycle.get_mode(ts)
+            if mode_change is not None:
+                mode, set_mode = mode_change
+                if logging.getLogger().isEnabledFor(logging.DEBUG):
+                    logging.debug(
+                        "%s set opmode %s until %s",
+                        datetime.datetime.fromtimestamp(ts, local_tz).strftime("%H:%M:%S.%f"),
+                        mode,
+                        datetime.datetime.fromtimestamp(cycle.next_change),
+                    )
+                set_mode(mode)
+
+            is_record, msg = device.receive_record(timeout=min(cycle.next_change - ts, 1.0))
+            if msg is None:
+                continue
 
-        msg = device.receive_message(timeout=min(cycle.next_change - ts, 1.0))
-        if msg is None:
-            continue
+            if is_record:
+                r = msg
 
-        event_type = msg.get("event", None)
+                # Ignore record in case the setting to include extended record fields has not yet kicked in
+                if "a_electrometer_current_mean" not in r:
+                    continue
 
-        if event_type == "record":
-            r = msg["params"]
+                # Fields that are missing or null in the record are stored as NaN
+                for f in FIELDS:
+                    if r.get(f) is None:
+                        r[f] = nan
 
-            # Ignore record in case the setting to include extended record fields has not yet kicked in
-            if "a_electrometer_current_mean" not in r:
-                continue
+                r["is_settling"] = 1 if r["is_settling"] else 0
+
+                now = datetime.datetime.fromtimestamp(time.time(), local_tz)
+                begin_time = now - timedelta(milliseconds=r["end_time_ms"] - r["begin_time_ms"])
 
-            for f in FIELDS:
-                if r.get(f, None) is None:
-                    r[f] = math.nan
-
-            r["is_settling"] = 1 if r["is_settling"] else 0
-
-            now = datetime.datetime.utcnow().replace(tzinfo=UTC).astimezone(config.local_tz)
-
-            out_file, is_new_file = records_file.get(now)
-            if is_new_file:
-                write_records_file_header(out_file)
-
-            begin_time = now - datetime.timedelta(milliseconds=r["end_time_ms"] - r["begin_time_ms"])
-            cols = (
-                [
-                    str(begin_time),
-                    str(now),
-                    r["opmode"],
-                    r["a_electrometer_current_mean"],
-                    r["b_electrometer_current_mean"],
-                    r["a_electrometer_current_stddev"],
-                    r["b_electrometer_current_stddev"],
-                    r["a_electrometer_current_raw_mean"],
-                    r["b_electrometer_current_raw_mean"],
-                    r["a_electrometer_voltage"],
-                    r["b_electrometer_voltage"],
-                ]
-                + [r[f] for f in FIELDS]
-                + [""]
-            )
-            out_file.write("\t".join(format_field(x) for x in cols))
-            out_file.write("\n")
-            out_file.flush()
-
-            # fmt: off
-            print(
-                f"{begin_time:%H:%M:%S.%f} {r['begin_time_ms'] / 1000:9.1f} {(r['end_time_ms'] - r['begin_time_ms']) / 1000:9.1f} {r['opmode']:12} {'settl' if r['is_settling'] else 'ok   '}"
-                f" pos_conc: {r['pos_concentration_mean']:10.3f} neg_conc: {r['neg_concentration_mean']:10.3f} "
-                f" a: {r['a_electrometer_current_mean']:+9.2f} {r['a_electrometer_current_raw_mean'] - r['a_electrometer_current_mean']:+6.2f}"
-                f" b: {r['b_electrometer_current_mean']:+9.2f} {r['b_electrometer_current_raw_mean'] - r['b_electrometer_current_mean']:+6.2f}"
-                # f" acev: {r['a_cev_voltage_mean']:+6.2f} {r['a_cev_voltage_raw_mean']:+6.2f} {r['a_cev_voltage_control_mean']:+6.2f}",
-                # f" flags:{[flag_map[f] for f in r['flags']]}"
-            )
-            # fmt: on
-
-            for f in MONITORED_COUNTERS:
-                if r[f] != counter_values[f]:
-                    print(f"  {f}: {counter_values[f]} -> {r[f]}")
-                    counter_values[f] = r[f]
-
-        elif event_type == "raw_em_record":
-            now = datetime.datetime.utcnow().replace(tzinfo=UTC)
-            params = msg.get("params", None)
-            if params:
-                ch = params.get("channel", None)
-                t = params.get("time", None)
-                data = params.get("data", None)
-                if isinstance(data, dict):
-                    value = data.get("value", None)
+                if parquet_file is not None:
+                    parquet_file.append(begin_time, now, r)
                 else:
-                    value = None
-                if ch is not None and value is not None:
-                    out_file, is_new_file = raw_em_file.get(now)
+                    out_file, is_new_file = records_file.get(now)
                     if is_new_file:
-                        out_file.write("timestamp,mcutime,channel,value\n")
-                    out_file.write(f"{now.timestamp()},{t},{ch},{value}\n")
+                        write_records_file_header(out_file)
+
+                    values = (
+                        str(begin_time),
+                        str(now),
+                        format_field(r["opmode"]),
+                        r["a_electrometer_current_mean"],
+                        r["b_electrometer_current_mean"],
+                        r["a_electrometer_current_stddev"],
+                        r["b_electrometer_current_stddev"],
+                        r["a_electrometer_current_raw_mean"],
+                        r["b_electrometer_current_raw_mean"],
+                        r["a_electrometer_voltage"],
+                        r["b_electrometer_voltage"],
+                    ) + _FIELDS_GETTER(r)
+                    try:
+                        line = line_format % values
+                    except TypeError:
+                        # A non-numeric value in a rounded column, the record is written without rounding
+                        line = RECORDS_LINE_FORMAT % values
+                    out_file.write(line.encode("utf8"))
+                    records_file.maybe_flush()
+
+                if logging.getLogger().isEnabledFor(logging.INFO):
+                    flags = tuple(r.get("flags") or ())
+                    flags_desc = flag_descriptions.get(flags)
+                    if flags_desc is None:
+                        flags_desc = flag_descriptions[flags] = str([flag_map.get(f, f) for f in flags])
+
+                    logging.info(
+                        RECORD_SUMMARY_FORMAT,
+                        begin_time.strftime("%H:%M:%S.%f"),
+                        r["begin_time_ms"] / 1000,
+                        (r["end_time_ms"] - r["begin_time_ms"]) / 1000,
+                        r["opmode"],
+                        "settl" if r["is_settling"] else "ok   ",
+                        r["pos_concentration_mean"],
+                        r["neg_concentration_mean"],
+                        r["a_electrometer_current_mean"],
+                        r["a_electrometer_current_raw_mean"] - r["a_electrometer_current_mean"],
+                        r["b_electrometer_current_mean"],
+                        r["b_electrometer_current_raw_mean"] - r["b_electrometer_current_mean"],
+                        flags_desc,
+                    )
+
+                counters = _MONITORED_COUNTERS_GETTER(r)
+                if counters != counter_values:
+                    for f, old_value, value in zip(MONITORED_COUNTERS, counter_values, counters):
+                        if value != old_value:
+                            logging.info("  %s: %s -> %s", f, old_value, value)
+                    counter_values = counters
+
+            elif msg.get("event", None) == "raw_em_record":
+                ts = time.time()
+                params = msg.get("params", None)
+                if params:
+                    ch = params.get("channel", None)
+                    t = params.get("time", None)
+                    data = params.get("data", None)
+                    if isinstance(data, dict):
+                        value = data.get("value", None)
+                    else:
+                        value = None
+                    if ch is not None and value is not None:
+                        out_file, is_new_file = raw_em_file.get(datetime.datetime.fromtimestamp(ts, UTC))
+                        if raw_em_binary:
+                            try:
+                                sample = RAW_EM_BINARY_RECORD.pack(ts, -1 if t is None else t, ch, value)
+                            except struct.error as e:
+                                logging.warning("Skipping raw electrometer sample %s: %s", params, e)
+                                continue
+                            # The file is opened for appending, an existing file already starts with the magic
+                            if is_new_file and out_file.tell() == 0:
+                                out_file.write(RAW_EM_BINARY_MAGIC)
+                            out_file.write(sample)
+                        else:
+                            if is_new_file:
+                                out_file.write(b"timestamp,mcutime,channel,value\n")
+                            out_file.write(f"{ts},{t},{ch},{value}\n".encode("utf8"))
+                        raw_em_file.maybe_flush()
+
+            else:
+                logging.debug("Other message: %s", msg)
+    finally:
+        # Buffered output of the files is written also when the connection to the device fails
+        try:
+            if records_file is not None:
+                records_file.close()
+            if parquet_file is not None:
+                parquet_file.close()
+        finally:
+            raw_em_file.close()
+
+
+def read_raw_em_binary(file_name) -> Iterator[Tuple[float, int, int, float]]:
+    """
+    Reads a binary raw electrometer file
+
+    An incomplete record at the end of the file, e.g. due to an interrupted write, is ignored.
+
+    :param file_name: path of the file
+    :return: iterator of (timestamp, mcutime, channel, value) tuples, mcutime is -1 if it was not sent by the device
+    """
+    with open(file_name, "rb") as f:
+        data = f.read()
+
+    if not data.startswith(RAW_EM_BINARY_MAGIC):
+        raise airel.tic.TicError(f"{file_name} is not a binary raw electrometer file")
+
+    start = len(RAW_EM_BINARY_MAGIC)
+    end = len(data) - (len(data) - start) % RAW_EM_BINARY_RECORD.size
+    return RAW_EM_BINARY_RECORD.iter_unpack(data[start:end])
 
-        else:
-            print("Other message:", msg)
+
+def records_line_format(float_digits: Optional[int] = None) -> str:
+    """
+    Returns the format string of a records file line
+
+    :param float_digits: number of significant digits of measurement values, ``None`` keeps full precision
+    """
+    if float_digits is None:
+        return RECORDS_LINE_FORMAT
+
+    float_spec = f"%.{float_digits}g"
+    specs = (
+        ["%s"] * 3
+        + [float_spec] * 8
+        + ["%s" if f in _INTEGER_FIELDS else float_spec for f in FIELDS]
+    )
+    return "\t".join(specs) + "\t\n"
 
 
 def write_records_file_header(outfile):
+    outfile.write(records_file_header())
+
+
+@functools.lru_cache(maxsize=None)
+def records_file_header() -> bytes:
+    """
+    Returns the encoded records file header
+
+    The header only depends on constants, so it is built once and reused for every new file.
+    """
     params = []
 
     for f in FIELDS:
@@ -299,9 +454,7 @@ def write_records_file_header(outfile):
     yamldata = yaml.safe_dump(doc)
     yamlrows = "\n".join(f"# {line}" for line in yamldata.split("\n"))
 
-    outfile.write("# Spectops records\n")
-    outfile.write(yamlrows)
-    outfile.write("\n")
+    header = "# Spectops records\n" + yamlrows + "\n"
 
     colfields = (
         [
@@ -321,7 +474,8 @@ def write_records_file_header(outfile):
         + ["flags"]
     )
 
-    outfile.write("\t".join(colfields) + "\n")
+    header += "\t".join(colfields) + "\n"
+    return header.encode("utf8")
 
 
 def format_field(x):
@@ -343,40 +497,171 @@ def setup_logging():
 
 
 class TimedFile:
-    def __init__(self, name_template: str):
+    """
+    Output file whose name is determined by a timestamp
+
+    The name template is formatted with the timestamp as ``t``. It is only evaluated again when the date of the
+    timestamp changes, so the template must not depend on the time of day.
+    """
+
+    def __init__(self, name_template: str, flush_batch_size: int = 8, flush_interval: float = 10.0):
         self.name_template = name_template
+        self.flush_batch_size = flush_batch_size
+        self.flush_interval = flush_interval
         self.file = None
         self.file_name = None
+        self._last_ordinal = None
+        self._pending = 0
+        self._last_flush = time.monotonic()
 
     def get(self, t):
+        ordinal = t.toordinal()
+        if ordinal == self._last_ordinal:
+            return self.file, False
+
         file_name = self.name_template.format(t=t)
-        if self.file_name != file_name:
+        is_new_file = self.file_name != file_name
+        if is_new_file:
             if self.file:
                 self.file.close()
 
             pathlib.Path(file_name).parent.mkdir(exist_ok=True, parents=True)
             self.file_name = file_name
-            self.file = open(file_name, "a")
-            return self.file, True
-        else:
-            return self.file, False
+            self.file = open(file_name, "ab", buffering=FILE_BUFFER_SIZE)
+            self._pending = 0
+            self._last_flush = time.monotonic()
+
+        self._last_ordinal = ordinal
+        return self.file, is_new_file
+
+    def maybe_flush(self):
+        """
+        Counts a written record and flushes the file once enough records have been written since the last flush
+        """
+        self._pending += 1
+        if self._pending >= self.flush_batch_size:
+            self.flush()
+
+    def flush_if_due(self):
+        """
+        Flushes the file if records have been written and enough time has passed since the last flush
+
+        Should be called regularly, so that records are written also when no further records follow.
+        """
+        if self._pending and time.monotonic() - self._last_flush > self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        if self.file:
+            self.file.flush()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        if self.file:
+            self.file.close()
+        self.file = None
+        self.file_name = None
+        self._last_ordinal = None
+
+
+class ParquetRecordsFile:
+    """
+    Records output in Parquet format, an alternative to the text records file
+
+    Records are buffered in memory and written as a row group once ``row_group_size`` records have been collected or
+    ``flush_interval`` seconds have passed since the previous row group. A new file is started when the date changes.
+    The name template is formatted with the end time of the first record of the file as ``t``, so it should include the
+    time of day to avoid overwriting a file of an earlier session.
+
+    Measurement values that are not numbers are stored as NaN, since a single value that cannot be converted would
+    prevent writing the row group. A Parquet file can only be read after it has been closed, so the file of a process
+    that is killed without calling close is lost.
+    """
+
+    def __init__(self, name_template: str, row_group_size: int = 1000, flush_interval: float = 600.0):
+        self.name_template = name_template
+        self.row_group_size = row_group_size
+        self.flush_interval = flush_interval
+        self.schema = pyarrow.schema(
+            [
+                ("begin_time", pyarrow.timestamp("us", tz="UTC")),
+                ("end_time", pyarrow.timestamp("us", tz="UTC")),
+                ("opmode", pyarrow.string()),
+            ]
+            + [(f, pyarrow.float64()) for f in FIELDS]
+        )
+        self.writer = None
+        self._ordinal = None
+        self._columns = {name: [] for name in self.schema.names}
+        self._field_columns = [self._columns[f] for f in FIELDS]
+        self._last_flush = time.monotonic()
+
+    def append(self, begin_time, end_time, r):
+        ordinal = end_time.toordinal()
+        if ordinal != self._ordinal:
+            self.close()
+            file_name = self.name_template.format(t=end_time)
+            pathlib.Path(file_name).parent.mkdir(exist_ok=True, parents=True)
+            self.writer = pyarrow.parquet.ParquetWriter(file_name, self.schema, compression="zstd")
+            self._ordinal = ordinal
+
+        self._columns["begin_time"].append(begin_time)
+        self._columns["end_time"].append(end_time)
+        opmode = r["opmode"]
+        self._columns["opmode"].append(None if opmode is None else str(opmode))
+        nan = math.nan
+        for values, value in zip(self._field_columns, _FIELDS_GETTER(r)):
+            values.append(float(value) if isinstance(value, (int, float)) else nan)
+
+        if (
+            len(self._columns["end_time"]) >= self.row_group_size
+            or time.monotonic() - self._last_flush > self.flush_interval
+        ):
+            self.flush()
+
+    def flush(self):
+        if self.writer is not None and self._columns["end_time"]:
+            try:
+                self.writer.write_table(pyarrow.Table.from_pydict(self._columns, schema=self.schema))
+            finally:
+                # Rows that could not be written are dropped, otherwise every later flush would fail on them as well
+                for values in self._columns.values():
+                    values.clear()
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            # The footer is written also when the last row group fails, so that the earlier row groups can be read
+            if self.writer is not None:
+                self.writer.close()
+            self.writer = None
+            self._ordinal = None
 
 
 class MeasurementCycle:
-    def __init__(self, cycle_def, shift):
+    def __init__(self, cycle_def, shift, device: airel.tic.Tic):
         self.cycle_def = cycle_def
         self.shift = shift
-        self.total_duration = sum(x[1] for x in cycle_def)
+        # Each mode with the device method that sets it, custom modes are given as dicts of parameters
+        self.modes = [
+            (mode, device.set_custom_mode if isinstance(mode, dict) else device.set_mode) for mode, _ in cycle_def
+        ]
+        self.offsets = list(itertools.accumulate((duration for _, duration in cycle_def), initial=0))
+        self.total_duration = self.offsets[-1]
         self.next_change = None
 
     def get_mode(self, timestamp):
+        """
+        Returns a (mode, setter) tuple if the timestamp is past the previous mode change, otherwise None
+
+        Calling ``setter(mode)`` sets the device to the mode.
+        """
         if self.next_change is None or timestamp > self.next_change:
             cycles_since_epoch, rel_t = divmod(timestamp - self.shift, self.total_duration)
-            self.next_change = cycles_since_epoch * self.total_duration + self.shift
-            for mode, duration in self.cycle_def:
-                if rel_t <= duration:
-                    self.next_change += duration
-                    return mode
-                else:
-                    self.next_change += duration
-                    rel_t -= duration
+            # Mode i is active for offsets[i] < rel_t <= offsets[i + 1], the first mode also at rel_t == 0
+            i = bisect.bisect_left(self.offsets, rel_t, 1) - 1
+            self.next_change = cycles_since_epoch * self.total_duration + self.shift + self.offsets[i + 1]
+            return self.modes[i]